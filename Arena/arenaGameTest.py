@@ -7,7 +7,7 @@ import sys
 import pygame
 from typing import Optional, Tuple
 from environment import SPEEN_AND_VROOM, BORING_4D_PAD, SPEEN_VROOM_ALL_ACTIONS, BORING_4D_PAD_ALL_ACTIONS
-from environment.arena import ArenaEnv, A_NONE, A_SHOOT, A_1_FORWARD, A_1_LEFT, A_1_RIGHT, A_2_UP, A_2_DOWN, A_2_LEFT, A_2_RIGHT, ALL_ACTIONS
+from environment.arena import ArenaEnv, A_NONE, A_SHOOT, A_1_FORWARD, A_1_LEFT, A_1_RIGHT, A_2_UP, A_2_DOWN, A_2_LEFT, A_2_RIGHT, ACTION_INDEX
 from environment import entities
 
 
@@ -21,40 +21,31 @@ else:
 
 clock = pygame.time.Clock()
 
+# Held movement keys of each control style, bit i of the pressed mask is key i
+HELD_KEYS = {
+    SPEEN_AND_VROOM: [(pygame.K_UP, A_1_FORWARD)],
+    BORING_4D_PAD:   [(pygame.K_w, A_2_UP), (pygame.K_s, A_2_DOWN), (pygame.K_a, A_2_LEFT), (pygame.K_d, A_2_RIGHT)]
+}
+# Pressed mask -> action, masks with several keys held are missing and leave the action unchanged
+HELD_ACTIONS = {style: {1 << bit: action for bit, (_, action) in enumerate(held)} for style, held in HELD_KEYS.items()}
+
 running = True
-forward = False
-upward = False
-leftward = False
-rightward = False
-downward = False
 e = None
 arena.reset()
 while running:
-    control = 0
     do = A_NONE
-    control_style = None
+    style = arena.control_style
     
+    # Only one-shot keys go through the event queue
     for event in pygame.event.get():
-        if event == pygame.QUIT:
+        if event.type == pygame.QUIT:
             running = False
         elif event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 running = False
-            if event.key == pygame.K_w:
-                upward = True
-            elif event.key == pygame.K_a:
-                leftward = True
-            elif event.key == pygame.K_d:
-                rightward = True
-            elif event.key == pygame.K_s:
-                downward = True
-            if event.key == pygame.K_UP:
-                forward = True
-            elif event.key == pygame.K_LEFT:
-                control_style = SPEEN_AND_VROOM
+            if event.key == pygame.K_LEFT and style == SPEEN_AND_VROOM:
                 do = A_1_LEFT
-            elif event.key == pygame.K_RIGHT:
-                control_style = SPEEN_AND_VROOM
+            elif event.key == pygame.K_RIGHT and style == SPEEN_AND_VROOM:
                 do = A_1_RIGHT
             elif event.key == pygame.K_z or event.key == pygame.K_j:
                 do = A_SHOOT
@@ -66,42 +57,15 @@ while running:
                 for htb in arena.hittables[:]:
                     if isinstance(htb, entities.Enemy):
                         htb.destroy()
-        elif event.type == pygame.KEYUP:
-            if event.key == pygame.K_w:
-                upward = False
-            elif event.key == pygame.K_a:
-                leftward = False
-            elif event.key == pygame.K_d:
-                rightward = False
-            elif event.key == pygame.K_s:
-                downward = False
-            if event.key == pygame.K_UP:
-                forward = False
-    
-    if forward and do != A_SHOOT:
-        control += 1
-        control_style = SPEEN_AND_VROOM
-        do = A_1_FORWARD
-    if control_style is None and do != A_SHOOT:
-        if upward:
-            control += 1
-            control_style = BORING_4D_PAD
-            do = A_2_UP
-        if downward:
-            control += 1
-            control_style = BORING_4D_PAD
-            do = A_2_DOWN
-        if leftward:
-            control += 1
-            control_style = BORING_4D_PAD
-            do = A_2_LEFT
-        if rightward:
-            control += 1
-            control_style = BORING_4D_PAD
-            do = A_2_RIGHT
-        if control > 1:
-            do = A_NONE
-    arena.step(ALL_ACTIONS[arena.control_style].index(do))
+
+    # Held movement keys are read from the keyboard state once per frame
+    if do != A_SHOOT:
+        keys = pygame.key.get_pressed()
+        pressed = 0
+        for bit, (key, _) in enumerate(HELD_KEYS[style]):
+            pressed |= keys[key] << bit
+        do = HELD_ACTIONS[style].get(pressed, do)
+    arena.step(ACTION_INDEX[style][do])
     arena.render(0, 0, "Debug: SPACE clear all Enemy and Spawner")
     if not arena.alive:
         running = False
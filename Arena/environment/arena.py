@@ -5,17 +5,20 @@ f`Polygonkind is dead\nArea is fuel\nGPU is full`
 
 import pygame
 import math
-import random
 import enum
+import logging
 from dataclasses import dataclass
-from typing import Tuple, List, Set, Dict, Optional
+from typing import Tuple, List, Set, Dict, Optional, Callable
 
 import environment.vectorHelper as vectorHelper
+import environment.kernels as kernels
 
 import gymnasium as gym
 import numpy as np
 from gymnasium import spaces
 
+log = logging.getLogger(__name__)
+
 
 # Action sets
 SPEEN_AND_VROOM, BORING_4D_PAD = 0, 1
@@ -26,6 +29,8 @@ A_2_UP, A_2_DOWN, A_2_LEFT, A_2_RIGHT = 1, 2, 3, 4
 SPEEN_VROOM_ALL_ACTIONS = [A_NONE, A_1_FORWARD, A_1_LEFT, A_1_RIGHT, A_SHOOT]
 BORING_4D_PAD_ALL_ACTIONS = [A_NONE, A_2_UP, A_2_DOWN, A_2_LEFT, A_2_RIGHT, A_SHOOT]
 ALL_ACTIONS = [SPEEN_VROOM_ALL_ACTIONS, BORING_4D_PAD_ALL_ACTIONS]
+# Inverse of ALL_ACTIONS: action -> action index, per control style
+ACTION_INDEX = [{action: idx for idx, action in enumerate(actions)} for actions in ALL_ACTIONS]
 
 
 # Interaction variables
@@ -33,23 +38,29 @@ ARENA_WIDTH = 800
 ARENA_HEIGHT = 800
 ARENA_CORNERS = {
     "topleft": (0, 0),
-    "topright": (1000, 0),
-    "bottomright": (1000, 1000),
-    "bottomleft": (0, 1000)
+    "topright": (ARENA_WIDTH, 0),
+    "bottomright": (ARENA_WIDTH, ARENA_HEIGHT),
+    "bottomleft": (0, ARENA_HEIGHT)
 }
 NO_TARGET_POS = 10000.0  # Large finite value indicating no target found
+PHYSICS_FPS = 60         # Physics steps per simulated second, every step is exactly 1 / PHYSICS_FPS seconds
 
 
 class ArenaEnv(gym.Env):
     metadata = {"render_modes": ["human"], "render_fps": 60}
     
-    def __init__(self, control_style=SPEEN_AND_VROOM, size: Tuple[int, int] = (ARENA_WIDTH, ARENA_HEIGHT), difficulty: int = 0, render_mode: str = None):
+    def __init__(self, control_style=SPEEN_AND_VROOM, size: Tuple[int, int] = (ARENA_WIDTH, ARENA_HEIGHT), difficulty: int = 0, render_mode: str = None,
+                 physics_fps: int = PHYSICS_FPS):
         # Arena info
         self.size = size
+        self.bounds = np.array([ARENA_WIDTH, ARENA_HEIGHT], dtype=np.float64)
         self.difficulty = difficulty
         self.start: Tuple[float, float] = (ARENA_WIDTH / 2, ARENA_HEIGHT / 2)
         self.render_mode = render_mode
         self.control_style = control_style
+        # Fixed timestep, simulated time only advances with step_count and never reads the wall clock
+        self.physics_fps = physics_fps
+        self.fixed_dt = 1.0 / physics_fps
 
         self.max_steps = 2000
         
@@ -59,6 +70,9 @@ class ArenaEnv(gym.Env):
             self.action_space = spaces.Discrete(5)  # 0-4 (no unused action)
         else:
             self.action_space = spaces.Discrete(6)  # 0-5
+        # Action index -> Agent function (None does nothing), resolved once for this control style
+        self.action_fns: Tuple[Optional[Callable[["entities.Agent"], None]], ...] = tuple(
+            entities.Agent.ACTION_TABLE.get((self.control_style, a)) for a in ALL_ACTIONS[self.control_style])
         
         # Observation space: 19 elements
         # [pos_x, pos_y, vel_x, vel_y, point_x, point_y, 
@@ -75,6 +89,18 @@ class ArenaEnv(gym.Env):
         # These lists self-update when a new instance is created
         self.hittables: List[entities.Hittable] = []
         self.bullets: List[entities.Bullet] = []
+        # Bullets not shot by the agent, kept in sync by add_bullet/remove_bullet
+        self.enemy_bullets: List[entities.Bullet] = []
+        # Typed views of hittables, kept in sync by add_hittable/remove_hittable
+        self.spawners: List[entities.Spawner] = []
+        self.enemies: List[entities.Enemy] = []
+        self.husks: List[entities.Husk] = []
+        # Hittable.kind -> typed list, cleared in place on reset so these stay the same lists
+        self.typed_hittables: Dict[str, List[entities.Hittable]] = {
+            "spawners": self.spawners,
+            "enemies": self.enemies,
+            "husks": self.husks
+        }
 
         # State variables (initialized in reset)
         self.agent: entities.Agent = None
@@ -85,8 +111,14 @@ class ArenaEnv(gym.Env):
         # Spawn indication
         self.out_of_spawners = -999
         self.teleporters: List[entities.Teleporter] = []
-        self.spawners: List[entities.Spawner] = []
-        self.enemies: List[entities.Enemy] = []
+
+        # Positions of nearest-target candidates, (N, 2) arrays refreshed once per frame
+        self.target_xy: np.ndarray = np.empty((0, 2))
+        self.target_bounds: Tuple[int, int, int] = (0, 0, 0)
+        self.enemy_xy: np.ndarray = self.target_xy
+        self.spawner_xy: np.ndarray = self.target_xy
+        self.bullet_xy: np.ndarray = self.target_xy
+        self.closest: List[Tuple[int, float]] = [(-1, 10000.0)] * 3
         
         # Renderer setup
         self.renderer: Optional[ArenaRenderer] = None
@@ -99,8 +131,16 @@ class ArenaEnv(gym.Env):
         
         self.difficulty = 0
 
+        for htb in self.hittables:
+            htb.registered = False
         self.hittables.clear()
+        for b in self.bullets:
+            b.registered = False
         self.bullets.clear()
+        self.enemy_bullets.clear()
+        self.spawners.clear()
+        self.enemies.clear()
+        self.husks.clear()
         
         self.agent = entities.Agent(self.start, angle=0.0, env=self)
         self.score = 0
@@ -110,28 +150,58 @@ class ArenaEnv(gym.Env):
         self.out_of_spawners = -999
         self.teleporters = [entities.Teleporter(pos, 0, env=self) for pos in self.select_spawners_positions()]
         self.try_spawning_spawners()
-        self.spawners = [spn for spn in self.hittables if isinstance(spn, entities.Spawner)]
-        self.enemies = [enem for enem in self.hittables if isinstance(enem, entities.Enemy)]
+        self.refresh_positions()
 
         observation = self._get_observation()
         return observation, {}
 
+    def add_hittable(self, hittable: "entities.Hittable"):
+        """Register a hittable and sort it into its typed list"""
+        hittable.registered = True
+        self.hittables.append(hittable)
+        if hittable.kind is not None:
+            self.typed_hittables[hittable.kind].append(hittable)
+
+    def remove_hittable(self, hittable: "entities.Hittable") -> bool:
+        """Unregister a hittable from all lists, returns False if it was not registered"""
+        if not hittable.registered:
+            return False
+        hittable.registered = False
+        self.hittables.remove(hittable)
+        if hittable.kind is not None:
+            self.typed_hittables[hittable.kind].remove(hittable)
+        return True
+
+    def add_bullet(self, bullet: "entities.Bullet"):
+        """Register a bullet, also into `enemy_bullets` if the agent did not shoot it"""
+        bullet.registered = True
+        self.bullets.append(bullet)
+        if bullet.owner is not self.agent:
+            self.enemy_bullets.append(bullet)
+
+    def remove_bullet(self, bullet: "entities.Bullet") -> bool:
+        """Unregister a bullet from all lists, returns False if it was not registered"""
+        if not bullet.registered:
+            return False
+        bullet.registered = False
+        self.bullets.remove(bullet)
+        if bullet.owner is not self.agent:
+            self.enemy_bullets.remove(bullet)
+        return True
+
     def select_spawners_positions(self) -> List[Tuple[float, float]]:
         """Randomly select positions to spawn spawners"""
         amount = self.difficulty + 1
         spawn_padding = 80
-        positions: List[Tuple] = []
-        for i in range(amount):
-            rand_x = random.randint(80, ARENA_WIDTH - spawn_padding)
-            rand_y = random.randint(80, ARENA_HEIGHT - spawn_padding)
-            rand_pos = (float(rand_x), float(rand_y))
-            # Select a random position at least 160 units away from agent position
-            while vectorHelper.vec_len(rand_pos, self.agent.position) < spawn_padding * 2:
-                rand_x = random.randint(80, ARENA_WIDTH - spawn_padding)
-                rand_y = random.randint(80, ARENA_HEIGHT - spawn_padding)
-                rand_pos = (float(rand_x), float(rand_y))
-            if rand_pos is not None:
-                positions.append(rand_pos)
+        min_dist_sq = (spawn_padding * 2) ** 2
+        positions: List[Tuple[float, float]] = []
+        # Sample candidates in batches, keeping those at least 160 units away from agent position
+        while len(positions) < amount:
+            candidates = self.np_random.integers(80, ARENA_WIDTH - spawn_padding, size=(amount * 4, 2),
+                                                 endpoint=True).astype(np.float64)
+            offsets = candidates - self.agent.position
+            accepted = candidates[np.einsum("ij,ij->i", offsets, offsets) >= min_dist_sq]
+            positions.extend((float(x), float(y)) for x, y in accepted[:amount - len(positions)])
         return positions
     
     def _get_observation(self) -> np.ndarray:
@@ -146,6 +216,29 @@ class ArenaEnv(gym.Env):
         for tper in self.teleporters:
             tper.try_spawn_with_cooldown(tper.pos, entities.SPAWN_SPAWNER, self.difficulty, self.agent)
 
+    def refresh_positions(self):
+        """Rebuild the position table used for nearest-target queries"""
+        positions = [enem.position for enem in self.enemies]
+        positions += [spn.position for spn in self.spawners]
+        positions += [bullet.position for bullet in self.enemy_bullets]
+        self.target_xy = np.array(positions, dtype=np.float64).reshape(-1, 2)
+        # Enemies, spawners and enemy bullets are consecutive slices of target_xy
+        enemies_end = len(self.enemies)
+        spawners_end = enemies_end + len(self.spawners)
+        self.target_bounds = (enemies_end, spawners_end, len(positions))
+        self.enemy_xy = self.target_xy[:enemies_end]
+        self.spawner_xy = self.target_xy[enemies_end:spawners_end]
+        self.bullet_xy = self.target_xy[spawners_end:]
+        # Shared by encode_state and the reward in step, nothing moves in between
+        self.closest = self.nearest_targets()
+
+    def nearest_targets(self) -> List[Tuple[int, float]]:
+        """
+        Index of and distance to the nearest enemy, spawner and enemy bullet, in one pass\n
+        Indices are into `enemy_xy`, `spawner_xy` and `bullet_xy`, (-1, 10000.0) if there is none
+        """
+        return kernels.nearest_in_slices(self.target_xy, self.agent.position, self.target_bounds)
+
     def encode_state(self) -> Tuple:
         """
         Returns a tuple representing the current state of the Arena\n
@@ -163,59 +256,58 @@ class ArenaEnv(gym.Env):
         """
         agent_pointing = vectorHelper.ang_to_vec(self.agent.angle)
 
-        closest_enemy: entities.Enemy = None
-        closest_enemy_dist: float = 10000.0
-        for enem in self.enemies:
-            dist = vectorHelper.vec_len(self.agent.position, enem.position)
-            if dist < closest_enemy_dist:
-                closest_enemy_dist = dist
-                closest_enemy = enem
-        
-        
-        closest_spawner: entities.Spawner = None
-        closest_spawner_dist: float = 10000.0
-        for spn in self.spawners:
-            dist = vectorHelper.vec_len(self.agent.position, spn.position)
-            if dist < closest_spawner_dist:
-                closest_spawner_dist = dist
-                closest_spawner = spn
-
-
-        enemy_bullets = [bullet for bullet in self.bullets if bullet.owner != self.agent]
-        closest_enemy_bullet: entities.Spawner = None
-        closest_enemy_bullet_dist: float = 10000.0
-        for bullet in enemy_bullets:
-            dist = vectorHelper.vec_len(self.agent.position, bullet.position)
-            if dist < closest_enemy_bullet_dist:
-                closest_enemy_bullet_dist = dist
-                closest_enemy_bullet = bullet
+        (enemy_idx, closest_enemy_dist), (spawner_idx, closest_spawner_dist), \
+            (bullet_idx, closest_enemy_bullet_dist) = self.closest
+        closest_enemy = self.enemy_xy[enemy_idx] if enemy_idx >= 0 else (NO_TARGET_POS, NO_TARGET_POS)
+        closest_spawner = self.spawner_xy[spawner_idx] if spawner_idx >= 0 else (NO_TARGET_POS, NO_TARGET_POS)
+        closest_enemy_bullet = self.bullet_xy[bullet_idx] if bullet_idx >= 0 else (NO_TARGET_POS, NO_TARGET_POS)
 
-        
         state = (self.agent.position[0], self.agent.position[1], self.agent.velocity[0], self.agent.velocity[1],
                  agent_pointing[0], agent_pointing[1],
-                 closest_enemy_dist,
-                 closest_enemy.position[0] if closest_enemy is not None else NO_TARGET_POS,
-                 closest_enemy.position[1] if closest_enemy is not None else NO_TARGET_POS,
-                 closest_spawner_dist,
-                 closest_spawner.position[0] if closest_spawner is not None else NO_TARGET_POS,
-                 closest_spawner.position[1] if closest_spawner is not None else NO_TARGET_POS,
-                 closest_enemy_bullet_dist,
-                 closest_enemy_bullet.position[0] if closest_enemy_bullet is not None else NO_TARGET_POS,
-                 closest_enemy_bullet.position[1] if closest_enemy_bullet is not None else NO_TARGET_POS,
+                 closest_enemy_dist, closest_enemy[0], closest_enemy[1],
+                 closest_spawner_dist, closest_spawner[0], closest_spawner[1],
+                 closest_enemy_bullet_dist, closest_enemy_bullet[0], closest_enemy_bullet[1],
                  self.agent.health, self.agent.max_health, self.agent.power, self.difficulty)
         return state
 
-    def update(self, dt = 1/60):
+    def update_bullets(self, dt: float):
+        """
+        Update all bullets\n
+        Movement, bounds and swept hit tests of plain bullets are computed as one NumPy batch,
+        hits are then applied bullet by bullet in list order
+        """
+        bullets = self.bullets[:]
+        # Bullets with their own update (explosions) are not batched
+        batched = [b for b in bullets if type(b).update is entities.Bullet.update]
+        if len(batched) > 0:
+            directions = np.array([b.direction for b in batched], dtype=np.float64)
+            speeds = np.array([b.speed for b in batched], dtype=np.float64)
+            movements = directions * speeds[:, None] * dt
+            positions = np.array([b.position for b in batched], dtype=np.float64) + movements
+            rects = np.array([(b.hitbox.left, b.hitbox.top, b.hitbox.right, b.hitbox.bottom) for b in batched],
+                             dtype=np.float64)
+            half_sizes = (rects[:, 2:] - rects[:, :2]) / 2
+            out_of_bounds = ((positions < -half_sizes) | (positions > self.bounds + half_sizes)).any(axis=1)
+            hits = entities.rect_sweep_batch(rects, movements, self.hittables, [b.owner_eid for b in batched])
+            results = iter(zip(positions.tolist(), out_of_bounds.tolist(), hits))
+        for b in bullets:
+            if type(b).update is entities.Bullet.update:
+                position, oob, gottem = next(results)
+                b.advance(tuple(position), oob, gottem)
+            else:
+                b.update(dt)
+
+    def update(self, dt: Optional[float] = None):
+        if dt is None:
+            dt = self.fixed_dt
         current_time = self.step_count * dt * 1000
-        for b in self.bullets[:]:
-            b.update(dt)
+        self.update_bullets(dt)
         for h in self.hittables[:]:
             h.update(dt)
 
         # Updating frame
-        self.spawners: List[entities.Spawner] = [spn for spn in self.hittables if isinstance(spn, entities.Spawner)]
-        self.enemies: List[entities.Enemy] = [enem for enem in self.hittables if isinstance(enem, entities.Enemy)]
         self.alive = not self.agent.out_of_health()
+        self.refresh_positions()
 
         # Skip the rest if not alive
         if not self.alive:
@@ -251,7 +343,7 @@ class ArenaEnv(gym.Env):
             truncated: bool whether episode was truncated (time limit)
             info: dict with additional info
         """
-        dt = 1.0/60.0
+        dt = self.fixed_dt
 
         previous_score = self.score
         previous_hp = self.agent.health
@@ -259,7 +351,9 @@ class ArenaEnv(gym.Env):
         previous_difficulty = self.difficulty
 
         # Perform action
-        self.agent.do(style=self.control_style, action=ALL_ACTIONS[self.control_style][action])
+        perform = self.action_fns[action]
+        if perform is not None:
+            perform(self.agent)
         
         # Update environment
         self.update(dt)
@@ -299,30 +393,25 @@ class ArenaEnv(gym.Env):
         terminated = not self.alive
             
         if terminated:
-            print("Episode ended: TERMINATED")
+            log.debug("Episode ended: TERMINATED")
         if truncated:
-            print("Episode ended: TRUNCATED")
+            log.debug("Episode ended: TRUNCATED")
         
         info = {"step_count": self.step_count}
         
         
         if not terminated:
+            (enemy_idx, _), (spawner_idx, _), _ = self.closest
 
             # Find closest enemy
-            closest_enemy = None
-            closest_enemy_dist: float = 10000.0
+            closest_enemy = self.enemies[enemy_idx] if enemy_idx >= 0 else None
             
-            for enem in self.enemies[:]:
-                # Check for closer enemy
-                dist = vectorHelper.vec_len(self.agent.position, enem.position)
-                if dist < closest_enemy_dist:
-                    closest_enemy_dist = dist
-                    closest_enemy = enem
+            for enem in self.enemies:
                 # Add reward for each enemies hit within the last 100 ms    
                 if enem.invincible:
                     reward += 50 * dt
             # More reward if enemy died
-            for husk in [htb for htb in self.hittables if isinstance(htb, entities.Husk)]:
+            for husk in self.husks:
                 if husk.health >= 190:
                     reward += 100 * dt
             
@@ -334,15 +423,9 @@ class ArenaEnv(gym.Env):
             
 
             # Find closest spawner
-            closest_spawner = None
-            closest_spawner_dist: float = 10000.0
-
-            for spwn in self.spawners[:]:
-                # Check for closer spawner
-                dist = vectorHelper.vec_len(self.agent.position, spwn.position)
-                if dist < closest_spawner_dist:
-                    closest_spawner_dist = dist
-                    closest_spawner = spwn
+            closest_spawner = self.spawners[spawner_idx] if spawner_idx >= 0 else None
+
+            for spwn in self.spawners:
                 # Add reward for each spawner hit within the last 100 ms
                 if spwn.invincible:
                     reward += 200 * dt
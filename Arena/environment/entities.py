@@ -2,9 +2,11 @@
 
 import pygame
 import math
-import random
 import enum
-from typing import Tuple, List, Set, Dict, Optional
+import itertools
+from typing import Tuple, List, Set, Dict, Optional, Callable
+
+import numpy as np
 
 import environment.vectorHelper as vectorHelper
 import environment.arena as arena
@@ -19,6 +21,7 @@ SPAWNER_HITBOX_SIZE = 40
 
 # Global variables
 FRIC_COEF = 0.9      # How much velocity deteriorate every 1 second
+NEG_INF = float('-inf')  # Health of exploded rammers, which never count as killed
 
 
 # Spawner spawn what
@@ -27,6 +30,8 @@ SPAWN_ENEMY = False
 
 
 # Shape sweep collision detection
+EMPTY_EXCEPTIONS = frozenset()
+
 def rect_sweep(
     rect: pygame.Rect,
     vel: Tuple[float, float],
@@ -40,17 +45,17 @@ def rect_sweep(
     """
 
     if exceptions is None:
-        exceptions = set()
+        exceptions = EMPTY_EXCEPTIONS
 
     vx, vy = vel
     earliest_t = 1.0
     hit_object = None
 
-    not_friendlies = [obs for obs in obstacles if obs not in exceptions
-                      and obs.hitbox is not None]
-
-    for not_fren in not_friendlies:
+    # Skip friendlies and dead objects in place instead of filtering into a new list
+    for not_fren in obstacles:
         box = not_fren.hitbox
+        if box is None or not_fren in exceptions:
+            continue
 
         if rect.colliderect(box):
             earliest_t = -1
@@ -106,22 +111,105 @@ def rect_sweep(
 
     return hit_object
 
+def rect_sweep_batch(
+    rects: np.ndarray,
+    vels: np.ndarray,
+    obstacles: List["Hittable"],
+    exceptions: List[int]
+) -> List[Optional["Hittable"]]:
+    """
+    `rect_sweep` for many rects against the same obstacles at once\n
+    `rects` is (N, 4) of (left, top, right, bottom), `vels` is (N, 2),
+    rect i ignores the obstacle whose `eid` is `exceptions[i]` (-1 for none)\n
+    Returns the first Hittable hit by each rect, or None, with the same
+    tie-breaking as `rect_sweep`
+    """
+    candidates = [obs for obs in obstacles if obs.hitbox is not None]
+    if len(rects) == 0 or len(candidates) == 0:
+        return [None] * len(rects)
+
+    boxes = np.array([(c.hitbox.left, c.hitbox.top, c.hitbox.right, c.hitbox.bottom) for c in candidates],
+                     dtype=np.float64)
+    # Entity ids are never negative, so -1 excepts nothing
+    eids = np.array([c.eid for c in candidates], dtype=np.int64)
+    allowed = eids != np.array(exceptions, dtype=np.int64)[:, None]
+
+    # Rects are columns (N, 1), boxes are rows (H,), everything below is (N, H)
+    left, top, right, bottom = (rects[:, i:i + 1] for i in range(4))
+    box_l, box_t, box_r, box_b = boxes.T
+    vx, vy = vels[:, 0:1], vels[:, 1:2]
+
+    overlap = (left < box_r) & (top < box_b) & (right > box_l) & (bottom > box_t) & allowed
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tx_entry = np.where(vx > 0, box_l - right, box_r - left) / vx
+        tx_exit  = np.where(vx > 0, box_r - left, box_l - right) / vx
+        ty_entry = np.where(vy > 0, box_t - bottom, box_b - top) / vy
+        ty_exit  = np.where(vy > 0, box_b - top, box_t - bottom) / vy
+    # Not moving on an axis: always inside on that axis if overlapping, never otherwise
+    tx_entry = np.where(vx == 0, -np.inf, tx_entry)
+    tx_exit  = np.where(vx == 0, np.inf, tx_exit)
+    ty_entry = np.where(vy == 0, -np.inf, ty_entry)
+    ty_exit  = np.where(vy == 0, np.inf, ty_exit)
+    x_ok = (vx != 0) | ((right > box_l) & (left < box_r))
+    y_ok = (vy != 0) | ((bottom > box_t) & (top < box_b))
+
+    t_entry = np.maximum(tx_entry, ty_entry)
+    t_exit  = np.minimum(tx_exit, ty_exit)
+    valid = allowed & x_ok & y_ok & (t_entry <= t_exit) & (t_entry >= 0) & (t_entry < 1)
+    t_entry = np.where(valid, t_entry, np.inf)
+
+    # Overlapping boxes win over swept hits, the last one in order like rect_sweep
+    any_overlap = overlap.any(axis=1)
+    last_overlap = overlap.shape[1] - 1 - overlap[:, ::-1].argmax(axis=1)
+    earliest = t_entry.argmin(axis=1)
+    swept = np.isfinite(t_entry[np.arange(len(rects)), earliest])
+
+    hits: List[Optional["Hittable"]] = []
+    for row in range(len(rects)):
+        if any_overlap[row]:
+            hits.append(candidates[last_overlap[row]])
+        elif swept[row]:
+            hits.append(candidates[earliest[row]])
+        else:
+            hits.append(None)
+    return hits
+
+def farthest_corner(position: Tuple[float, float]) -> Tuple[int, int]:
+    """
+    The entry of `arena.ARENA_CORNERS` farthest from `position`, the diagonally opposite corner\n
+    Ties go to the earlier corner in ARENA_CORNERS order, same as scanning the corners for the longest distance
+    """
+    half_w = arena.ARENA_WIDTH / 2
+    half_h = arena.ARENA_HEIGHT / 2
+    x, y = position
+    right = x < half_w or (x == half_w and y < half_h)
+    bottom = y < half_h
+    if right:
+        return arena.ARENA_CORNERS["bottomright"] if bottom else arena.ARENA_CORNERS["topright"]
+    return arena.ARENA_CORNERS["bottomleft"] if bottom else arena.ARENA_CORNERS["topleft"]
+
 def get_current_time(env: arena.ArenaEnv):
-    return env.step_count * 1000 / 60 if env is not None else 0
+    return env.step_count * 1000 / env.physics_fps if env is not None else 0
 
 # Object classes
 class Bullet:
     """Projectiles used by player and enemies"""
+    # Bullets are the most numerous entity, skip the per-instance __dict__
+    __slots__ = ("owner", "owner_eid", "position", "direction", "speed", "damage", "hitbox", "registered", "env")
     def __init__(self, position: Tuple[float, float],
                  direction: Tuple[float, float],
                  owner: Optional["Hittable"] = None,
                  damage: int = 10,
                  speed: int = 200,
                  size: int = 1,
-                 env: arena.ArenaEnv = None):
+                 env: arena.ArenaEnv = None,
+                 normalized: bool = False):
+        """`normalized`: `direction` is already a unit vector and is used as is"""
         self.owner = owner
+        self.owner_eid = owner.eid if owner is not None else -1
         self.position = position
-        self.direction = vectorHelper.vec_norm(direction)
+        self.direction = direction if normalized else vectorHelper.vec_norm(direction)
         self.speed = speed
         self.damage = damage
         actual_size = BULLET_HITBOX_SIZE * size
@@ -129,33 +217,42 @@ class Bullet:
                                   position[1] - actual_size // 2,
                                   actual_size,
                                   actual_size)
+        self.registered = False     # Set by env.add_bullet/remove_bullet
         self.env = env
-        self.env.bullets.append(self)
+        self.env.add_bullet(self)
     def hit(self, hittable: "Hittable"):
         hittable.take_damage(self.damage)
-        self.env.bullets.remove(self)
+        self.env.remove_bullet(self)
     def update(self, dt: float):
         """Update object depending on the time since last update in seconds"""
-        if self not in self.env.bullets:
-            return
         movement = (self.direction[0] * self.speed * dt, self.direction[1] * self.speed * dt)
+        position = (self.position[0] + movement[0], self.position[1] + movement[1])
+        # If fully out of bounds after moving
+        half_w = self.hitbox.width / 2
+        half_h = self.hitbox.height / 2
+        out_of_bounds = (
+            position[0] < 0 - half_w or
+            position[0] > arena.ARENA_WIDTH + half_w or
+            position[1] < 0 - half_h or
+            position[1] > arena.ARENA_HEIGHT + half_h
+        )
         gottem = rect_sweep(self.hitbox, movement, self.env.hittables, exceptions={self.owner} if self.owner else None)
+        self.advance(position, out_of_bounds, gottem)
+    def advance(self, position: Tuple[float, float], out_of_bounds: bool, gottem: Optional["Hittable"]):
+        """Hit `gottem` if not None, otherwise move to `position`, see `ArenaEnv.update_bullets`"""
+        if not self.registered:
+            return
         if gottem is not None:
             self.hit(gottem)
             return
-        self.position = (self.position[0] + movement[0], self.position[1] + movement[1])
+        self.position = position
         # If fully out of bounds, remove self
-        if (
-            self.position[0] < 0 - self.hitbox.width / 2 or
-            self.position[0] > arena.ARENA_WIDTH + self.hitbox.width / 2 or
-            self.position[1] < 0 - self.hitbox.height / 2 or
-            self.position[1] > arena.ARENA_HEIGHT + self.hitbox.height / 2
-           ):
-            self.env.bullets.remove(self)
-        self.hitbox.update(int(self.position[0] - self.hitbox.width / 2),
-                           int(self.position[1] - self.hitbox.height / 2),
-                           self.hitbox.width,
-                           self.hitbox.height)
+        if out_of_bounds:
+            self.env.remove_bullet(self)
+        # Size never changes, only move the corner, plain int stores skip building a tuple
+        hitbox = self.hitbox
+        hitbox.x = int(position[0] - hitbox.width / 2)
+        hitbox.y = int(position[1] - hitbox.height / 2)
 
 class Explosion(Bullet):
     """Basically a stationary bullet that damages on contact"""
@@ -164,7 +261,7 @@ class Explosion(Bullet):
                  damage: int = 50,
                  radius: int = 20,
                  env: arena.ArenaEnv = None):
-        super().__init__(position, (0, 0), owner, damage, 0, 1, env)
+        super().__init__(position, (0.0, 0.0), owner, damage, 0, 1, env, normalized=True)
         self.hitbox = pygame.Rect(position[0] - radius,
                                   position[1] - radius,
                                   radius * 2,
@@ -172,39 +269,56 @@ class Explosion(Bullet):
         self.life_expectancy = 500    # milliseconds
         self.start_time = get_current_time(self.env)
         self.radius = radius
-        self.already_hit = []
+        self.already_hit: Set["Hittable"] = set()
     def update(self, dt: float):
         """Update object depending on the time since last update in seconds"""
         current_time = get_current_time(self.env)
         elapsed = current_time - self.start_time
         if current_time - self.start_time >= self.life_expectancy:
-            self.env.bullets.remove(self)
+            self.env.remove_bullet(self)
             return
         
-        not_hit = [h for h in self.env.hittables if h not in self.already_hit]
-
-        feasably_hit = [h for h in not_hit if h.hitbox
-                        and vectorHelper.vec_len(self.position, h.position) <= self.radius + math.hypot(h.hitbox.width/2, h.hitbox.width/2)]
-        for hittable in feasably_hit:
-            if hittable.hitbox and self.hitbox.colliderect(hittable.hitbox):
+        not_hit = [h for h in self.env.hittables if h.hitbox and h not in self.already_hit]
+        if len(not_hit) == 0:
+            return
 
-                hit_dir = vectorHelper.vec_sub(hittable.position, self.position)
-                hit_dir = vectorHelper.vec_norm(hit_dir)
-                
-                dist = max(1e-6, vectorHelper.vec_len(self.position, hittable.position))
-                falloff = (self.radius / 2) / ((dist + 1.0) ** 2)
+        # Broad phase as one batch: hittables whose half diagonal reaches into the blast radius
+        positions = np.array([h.position for h in not_hit], dtype=np.float64)
+        half_sizes = np.array([(h.hitbox.width / 2, h.hitbox.height / 2) for h in not_hit], dtype=np.float64)
+        reach = self.radius + np.hypot(half_sizes[:, 0], half_sizes[:, 1])
+        deltas = positions - self.position
+        dist_sq = np.sum(deltas ** 2, axis=1)
+        in_reach = np.flatnonzero(dist_sq <= reach ** 2)
+        if len(in_reach) == 0:
+            return
 
-                force = self.damage * falloff * 50
+        # Knockback direction and strength of every candidate in one go, only applied on an actual hit
+        deltas = deltas[in_reach]
+        lengths = np.hypot(deltas[:, 0], deltas[:, 1])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hit_dirs = np.where(lengths[:, None] == 0, 0.0, deltas / lengths[:, None])
+        falloffs = (self.radius / 2) / ((np.maximum(lengths, 1e-6) + 1.0) ** 2)
+        forces = self.damage * falloffs * 50
 
+        for i, hit_dir, force in zip(in_reach.tolist(), hit_dirs.tolist(), forces.tolist()):
+            hittable = not_hit[i]
+            if hittable.hitbox and self.hitbox.colliderect(hittable.hitbox):
                 # knockback = impulse
                 hittable.pushed((hit_dir[0] * force,
                                 hit_dir[1] * force))
 
                 # damage proportional to acceleration
                 hittable.take_damage(self.damage)
+                # Each hittable is only caught by the blast once
+                self.already_hit.add(hittable)
 
 class Hittable:
     """Base class for objects that can take damage, adds itself to self.env.hittables list"""
+    _eids = itertools.count()   # Source of unique entity ids
+    kind: Optional[str] = None  # Typed env list this class is sorted into, see ArenaEnv.typed_hittables
+    despawns_out_of_bounds = True   # Destroyed once fully outside the arena
+    leaves_husk = False             # destroy() leaves a Husk behind
+
     def __init__(
             self, position: Tuple[float, float],
             angle: float,
@@ -213,6 +327,7 @@ class Hittable:
             hitbox: Optional[pygame.Rect] = None,
             i_time: int = 600,
             env: arena.ArenaEnv = None):
+        self.eid = next(Hittable._eids)
         self.position = position
         self.velocity = (0.0, 0.0)
         self.accel = (0.0, 0.0)
@@ -225,8 +340,9 @@ class Hittable:
         self.invincible = False
         self.i_frames_start = -9999
         # Register self in self.env.hittables list
+        self.registered = False     # Set by env.add_hittable/remove_hittable
         self.env = env
-        self.env.hittables.append(self)
+        self.env.add_hittable(self)
     def take_damage(self, amount: int):
         if self.invincible:
             return
@@ -240,67 +356,67 @@ class Hittable:
                          self.velocity[1] + force[1])
     def update(self, dt: float):
         """Update object depending on the time since last update in seconds"""
-        if self.out_of_health():
-            if isinstance(self, Spawner) or isinstance(self, Enemy):
-                self.reward_player()
-            if isinstance(self, Enemy) and self.type == EnemyTypes.EXPLOSIVE_RAMMER:
-                self.explode()
+        # Inlined out_of_health
+        if 0 >= self.health > NEG_INF:
+            self.on_death()
             self.destroy()
         if self.invincible:
             current_time = get_current_time(self.env)
             if current_time - self.i_frames_start > self.i_time:
                 self.invincible = False
-        # Apply friction
-        friction = vectorHelper.vec_mul(self.velocity, -FRIC_COEF)
-        self.accel = vectorHelper.vec_add(self.accel, friction)
-        # Update velocity
-        self.velocity = (self.velocity[0] + self.accel[0] * dt,
-                         self.velocity[1] + self.accel[1] * dt)
-        self.velocity = vectorHelper.vec_lim(self.velocity, self.max_speed)
+        # Apply friction and update velocity, scalar math inlined since this runs for every hittable every frame
+        vx, vy = self.velocity
+        vx = vx + (self.accel[0] + vx * -FRIC_COEF) * dt
+        vy = vy + (self.accel[1] + vy * -FRIC_COEF) * dt
+        if math.hypot(vx, vy) > self.max_speed:
+            vx, vy = vectorHelper.vec_lim((vx, vy), self.max_speed)
+        self.velocity = (vx, vy)
         # Update position
-        self.position = (self.position[0] + self.velocity[0] * dt,
-                         self.position[1] + self.velocity[1] * dt)
+        x = self.position[0] + vx * dt
+        y = self.position[1] + vy * dt
+        self.position = (x, y)
         # If fully out of bounds, remove self
-        if not isinstance(self, Husk) and (
-            self.position[0] < 0 - self.hitbox.width / 2 or
-            self.position[0] > arena.ARENA_WIDTH + self.hitbox.width / 2 or
-            self.position[1] < 0 - self.hitbox.height / 2 or
-            self.position[1] > arena.ARENA_HEIGHT + self.hitbox.height / 2
-           ):
-            if isinstance(self, Enemy) and self.type == EnemyTypes.EXPLOSIVE_RAMMER:
-                # Explode before being removed
-                self.explode()
+        if self.despawns_out_of_bounds:
+            half_w = self.hitbox.width / 2
+            half_h = self.hitbox.height / 2
+            out_of_bounds = x < -half_w or x > arena.ARENA_WIDTH + half_w or y < -half_h or y > arena.ARENA_HEIGHT + half_h
+        else:
+            out_of_bounds = False
+        if out_of_bounds:
+            self.on_out_of_bounds()
             self.destroy()
-            if isinstance(self, Player):
-                self.health = 0
         # Stop if velocity is very low
         if abs(self.velocity[0]) < 1:
             self.velocity = (0.0, self.velocity[1])
         if abs(self.velocity[1]) < 1:
             self.velocity = (self.velocity[0], 0.0)
 
-        if self.hitbox is not None:
-            # Update hitbox if not destroyed
-            self.hitbox.update(int(self.position[0] - self.hitbox.width / 2),
-                               int(self.position[1] - self.hitbox.height / 2),
-                               self.hitbox.width,
-                               self.hitbox.height)
+        hitbox = self.hitbox
+        if hitbox is not None:
+            # Update hitbox if not destroyed, only the corner moves
+            hitbox.x = int(x - hitbox.width / 2)
+            hitbox.y = int(y - hitbox.height / 2)
         # Reset acceleration for next frame
         self.accel = (0.0, 0.0)
 
     def out_of_health(self) -> bool:
         """Returns true if health is at or below 0 but not negative infinity"""
-        return self.health <= 0 and self.health > float('-inf')
+        return 0 >= self.health > NEG_INF
+    def on_death(self):
+        """Called when health runs out, right before being destroyed"""
+    def on_out_of_bounds(self):
+        """Called when fully outside the arena, right before being destroyed"""
     def destroy(self):
-        """Remove self from self.env.hittables list and create a Husk"""
-        if self in self.env.hittables:
-            self.env.hittables.remove(self)
-        if not (isinstance(self, Player) or isinstance(self, Agent)) and not isinstance(self, Husk):
+        """Remove self from self.env.hittables list and create a Husk if `leaves_husk`"""
+        self.env.remove_hittable(self)
+        if self.leaves_husk:
             Husk(self.position, self.velocity, self.angle, self.max_speed,
-                 self.type if isinstance(self, Enemy) else None, isinstance(self, Spawner), self.env)
+                 self.type if self.kind == "enemies" else None, self.kind == "spawners", self.env)
 
 class Husk(Hittable):
     """Remains of enemies and spawner, despawn after 2 seconds"""
+    kind = "husks"
+    despawns_out_of_bounds = False
     def __init__(self, position,
                  velocity: Tuple[float, float] = (0.0, 0.0),
                  angle: float = 0.0,
@@ -335,14 +451,16 @@ class Player(Hittable):
         self.power = 10
         self.thrust = 100
         self.rotation_speed = 15.0 # degrees per action
+    def on_out_of_bounds(self):
+        self.health = 0
     def rotate(self, rotation_direction: int):
         """Rotate player by rotation_direction (1 clockwise, -1 anti-clockwise)"""
         self.angle += self.rotation_speed * rotation_direction
     def activate_thrust(self):
         """Move player forward in the direction they are facing"""
-        rad = math.radians(self.angle)
-        dx = math.cos(rad) * self.thrust
-        dy = math.sin(rad) * self.thrust
+        direction = vectorHelper.ang_to_vec(self.angle)
+        dx = direction[0] * self.thrust
+        dy = direction[1] * self.thrust
         self.accel = (dx, dy)
     def inertial_manipulator_up(self):
         """Move player up (negative y)"""
@@ -362,11 +480,10 @@ class Player(Hittable):
         self.activate_thrust()
     def shoot(self) -> Bullet:
         """Create a bullet moving in the direction the player is facing"""
-        rad = math.radians(self.angle)
-        direction = (math.cos(rad), math.sin(rad))
+        direction = vectorHelper.ang_to_vec(self.angle)
         bullet_start_pos = (self.position[0] + direction[0] * 5,
                             self.position[1] + direction[1] * 5)
-        return Bullet(bullet_start_pos, direction, owner=self, damage=self.power, env=self.env)
+        return Bullet(bullet_start_pos, direction, owner=self, damage=self.power, env=self.env, normalized=True)
     def heal(self, amount: int):
         """Heal the player by amount, increasing max health and damage if overheal"""
         # Polygonkind is dead
@@ -384,26 +501,26 @@ class Player(Hittable):
 
 class Agent(Player):
     """A Player specialized for training"""
+    # (control style, action) -> what to do, filled in below the class
+    ACTION_TABLE: Dict[Tuple[int, int], Callable[["Agent"], None]] = {}
+
     def do(self, style, action):
         """Perform an action"""
-        if action == arena.A_NONE: return
-        if action == arena.A_SHOOT: self.shoot()
-        if style == arena.SPEEN_AND_VROOM:
-            if action == arena.A_1_FORWARD:
-                self.activate_thrust()
-            elif action == arena.A_1_LEFT:
-                self.rotate(arena.ANTI_CLOCKWISE)
-            elif action == arena.A_1_RIGHT:
-                self.rotate(arena.CLOCKWISE)
-        elif style == arena.BORING_4D_PAD:
-            if action == arena.A_2_UP:
-                self.inertial_manipulator_up()
-            elif action == arena.A_2_DOWN:
-                self.inertial_manipulator_down()
-            elif action == arena.A_2_LEFT:
-                self.inertial_manipulator_left()
-            elif action == arena.A_2_RIGHT:
-                self.inertial_manipulator_right()
+        perform = self.ACTION_TABLE.get((style, action))
+        if perform is not None:
+            perform(self)
+
+Agent.ACTION_TABLE.update({
+    (arena.SPEEN_AND_VROOM, arena.A_SHOOT):     Agent.shoot,
+    (arena.SPEEN_AND_VROOM, arena.A_1_FORWARD): Agent.activate_thrust,
+    (arena.SPEEN_AND_VROOM, arena.A_1_LEFT):    lambda agent: agent.rotate(arena.ANTI_CLOCKWISE),
+    (arena.SPEEN_AND_VROOM, arena.A_1_RIGHT):   lambda agent: agent.rotate(arena.CLOCKWISE),
+    (arena.BORING_4D_PAD, arena.A_SHOOT):       Agent.shoot,
+    (arena.BORING_4D_PAD, arena.A_2_UP):        Agent.inertial_manipulator_up,
+    (arena.BORING_4D_PAD, arena.A_2_DOWN):      Agent.inertial_manipulator_down,
+    (arena.BORING_4D_PAD, arena.A_2_LEFT):      Agent.inertial_manipulator_left,
+    (arena.BORING_4D_PAD, arena.A_2_RIGHT):     Agent.inertial_manipulator_right,
+})
 
 class EnemyTypes(enum.Enum):
     RAMMER = 0
@@ -426,9 +543,20 @@ enemy_type_modifiers = {
     EnemyTypes.DIFFICULTY_LONGINUS: {"health": 7000.0,      "damage": float('inf'), "speed": 100.0, "force": float('inf'),  "size": 800.0,          "cooldown": 0.0,        "reward": 1000000.0},
 }
 SPAWNCEPTION_MAX_ITERATION = 0
+# Enemy type groups, built once here since a set display of enum members is rebuilt on every evaluation
+MOVE_TO_GOAL_TYPES = frozenset({EnemyTypes.RAMMER, EnemyTypes.TANKIER_RAMMER, EnemyTypes.EXPLOSIVE_RAMMER,
+                                EnemyTypes.GOTTAGOFAST, EnemyTypes.SPAWNCEPTION})
+SHOOTER_TYPES = frozenset({EnemyTypes.PEW_PEW, EnemyTypes.BIG_PEW_PEW})
+CHASE_PLAYER_TYPES = frozenset({EnemyTypes.RAMMER, EnemyTypes.TANKIER_RAMMER, EnemyTypes.EXPLOSIVE_RAMMER,
+                                EnemyTypes.GOTTAGOFAST, EnemyTypes.PEW_PEW, EnemyTypes.BIG_PEW_PEW})
+BONUS_REWARD_TYPES = frozenset({EnemyTypes.PEW_PEW, EnemyTypes.BIG_PEW_PEW, EnemyTypes.SPAWNCEPTION,
+                                EnemyTypes.DIFFICULTY_LONGINUS})     # 1.5x heal
+DOUBLE_REWARD_TYPES = frozenset({EnemyTypes.SPAWNCEPTION, EnemyTypes.DIFFICULTY_LONGINUS})  # Another 2x heal
 
 class Enemy(Hittable):
     """Enemy object"""
+    kind = "enemies"
+    leaves_husk = True
     def __init__(self, position: Tuple[float, float],
                  angle: float = 0.0,
                  difficulty: int = 0,
@@ -437,15 +565,16 @@ class Enemy(Hittable):
                  iteration: Optional[int] = None,
                  env: arena.ArenaEnv = None):
         """`angle` is in degrees"""
-        this_size = int(round(ENEMY_HITBOX_SIZE * (enemy_type_modifiers[type]["size"] / 100.0)))
+        mods = enemy_type_modifiers[type]
+        this_size = int(round(ENEMY_HITBOX_SIZE * (mods["size"] / 100.0)))
         rect = pygame.Rect(position[0] - this_size / 2,
                            position[1] - this_size / 2,
                            this_size,
                            this_size)
-        health = int(round((5 + difficulty * 5) * (enemy_type_modifiers[type]["health"] / 100.0)))
-        damage = int(round((1 + difficulty * 1) * (enemy_type_modifiers[type]["damage"] / 100.0)))
-        max_speed = (400.0 + difficulty * 10) * (enemy_type_modifiers[type]["speed"] / 100.0)
-        force = (100 + difficulty) * (enemy_type_modifiers[type]["force"] / 100.0)
+        health = int(round((5 + difficulty * 5) * (mods["health"] / 100.0)))
+        damage = int(round((1 + difficulty * 1) * (mods["damage"] / 100.0)))
+        max_speed = (400.0 + difficulty * 10) * (mods["speed"] / 100.0)
+        force = (100 + difficulty) * (mods["force"] / 100.0)
         super().__init__(position, angle, health, max_speed=max_speed, hitbox=rect, i_time=100, env=env)
         self.difficulty = difficulty
         self.target = target                            # Player
@@ -453,9 +582,9 @@ class Enemy(Hittable):
         self.type = type
         self.damage = damage
         self.force = force
-        self.reward = int(round(difficulty * (enemy_type_modifiers[type]["reward"] / 100.0)))
+        self.reward = int(round(difficulty * (mods["reward"] / 100.0)))
         self.last_cooldownable_action = -999
-        self.cooldown = int(round(max(500, 5000 - difficulty * 100) * (enemy_type_modifiers[type]["cooldown"] / 100.0)))
+        self.cooldown = int(round(max(500, 5000 - difficulty * 100) * (mods["cooldown"] / 100.0)))
         if self.type == EnemyTypes.SPAWNCEPTION:
             self.iteration = iteration if iteration is not None else 0
             self.actual_max_iter = int(round((SPAWNCEPTION_MAX_ITERATION + self.difficulty / 10))) if iteration is not None else 0
@@ -471,26 +600,30 @@ class Enemy(Hittable):
         direction = vectorHelper.vec_norm(to_player)
         bullet_start_pos = (self.position[0] + direction[0] * (self.hitbox.width / 2 + 5),
                             self.position[1] + direction[1] * (self.hitbox.height / 2 + 5))
-        return Bullet(bullet_start_pos, direction, owner=self, damage=self.damage, env=self.env)
+        return Bullet(bullet_start_pos, direction, owner=self, damage=self.damage, env=self.env, normalized=True)
     
     def explode(self) -> Explosion:
         """Create an explosion at the enemy's position (self-destructing)"""
-        self.health = float('-inf')
+        self.health = NEG_INF
         self.destroy()
         return Explosion(position=self.position, owner=None, damage=self.damage, radius=self.hitbox.width * 5, env=self.env)
     
     def achieve_goal(self, current_time, dt):
-        direction = vectorHelper.vec_sub(self.goal, self.position)
-        distance = vectorHelper.vec_len(direction)
-        direction = vectorHelper.vec_norm(direction)
-        if self.type in {EnemyTypes.RAMMER, EnemyTypes.TANKIER_RAMMER, EnemyTypes.EXPLOSIVE_RAMMER, EnemyTypes.GOTTAGOFAST, EnemyTypes.SPAWNCEPTION}:
+        # Inlined vec_sub/vec_len/vec_norm, the length is only computed once
+        dx = self.goal[0] - self.position[0]
+        dy = self.goal[1] - self.position[1]
+        distance = math.hypot(dx, dy)
+        if distance == 0 or not math.isfinite(distance):
+            direction = vectorHelper.vec_norm((dx, dy))
+        else:
+            direction = (dx / distance, dy / distance)
+        if self.type in MOVE_TO_GOAL_TYPES:
             self.accel = (direction[0] * self.force, direction[1] * self.force)
             # Explode if close enough (Explosive Rammer only)
             if self.type == EnemyTypes.EXPLOSIVE_RAMMER:
-                distance = vectorHelper.vec_len(vectorHelper.vec_sub(self.target.position, self.position))
-                if distance <= (self.hitbox.width * 4):
+                if vectorHelper.vec_len_sq(self.position, self.target.position) <= (self.hitbox.width * 4) ** 2:
                     self.explode()
-        elif self.type in {EnemyTypes.PEW_PEW, EnemyTypes.BIG_PEW_PEW}:
+        elif self.type in SHOOTER_TYPES:
             # Firing range
             aim_range = 300 + self.difficulty * 10
             if distance <= aim_range and current_time - self.last_cooldownable_action >= self.cooldown:
@@ -513,27 +646,21 @@ class Enemy(Hittable):
 
     def find_goal(self):
         """FSM, depending on enemy type"""
-        if self.type in {EnemyTypes.RAMMER, EnemyTypes.TANKIER_RAMMER, EnemyTypes.EXPLOSIVE_RAMMER, EnemyTypes.GOTTAGOFAST,
-                         EnemyTypes.PEW_PEW, EnemyTypes.BIG_PEW_PEW}:
+        if self.type in CHASE_PLAYER_TYPES:
             # Move towards player
-            self.goal = vectorHelper.vec_add(self.target.position,          # Predictive targeting increases with difficulty
-                                             vectorHelper.vec_mul(self.target.velocity,
-                                                                  min(1, self.difficulty * 0.05)))
+            target_pos = self.target.position
+            target_vel = self.target.velocity
+            lead = min(1, self.difficulty * 0.05)   # Predictive targeting increases with difficulty
+            self.goal = (target_pos[0] + target_vel[0] * lead,
+                         target_pos[1] + target_vel[1] * lead)
         elif self.type == EnemyTypes.SPAWNCEPTION:
             # Drift toward the furthest corner of the screen, spawning Rammers periodically
-            self.goal: Tuple = None
-            longest_dist = 0
-            for corner in arena.ARENA_CORNERS:
-                temp_goal = arena.ARENA_CORNERS[corner]
-                dist = vectorHelper.vec_len(self.position, temp_goal)
-                if dist > longest_dist:
-                    longest_dist = dist
-                    self.goal = temp_goal
+            self.goal = farthest_corner(self.position)
         elif self.type == EnemyTypes.DIFFICULTY_LONGINUS:
             # How did you get here???
             self.goal = ( 999999.0, 999999.0)
             print("Wrong class")
-        self.angle = vectorHelper.vec_to_ang(vectorHelper.vec_sub(self.goal, self.position))
+        self.angle = math.degrees(math.atan2(self.goal[1] - self.position[1], self.goal[0] - self.position[0])) % 360
     
     def collide(self, dt):
         gottem = rect_sweep(self.hitbox, vectorHelper.vec_mul(self.velocity, dt), [self.target])
@@ -541,29 +668,45 @@ class Enemy(Hittable):
             self.take_damage(self.damage)
             gottem.take_damage(self.damage)
             # Bounce
-            self_over_gottem_ratio = self.hitbox.width ** 2 / gottem.hitbox.width ** 2
-            gottem_on_self_force = vectorHelper.vec_mul(vectorHelper.vec_sub(gottem.velocity, self.velocity), 1 / self_over_gottem_ratio)
-            self_on_gottem_force = vectorHelper.vec_mul(vectorHelper.vec_sub(self.velocity, gottem.velocity), self_over_gottem_ratio)
-
-            self.velocity = vectorHelper.vec_add(self.velocity, gottem_on_self_force)
-            gottem.velocity = vectorHelper.vec_add(gottem.velocity, self_on_gottem_force)
+            self_vel = self.velocity
+            gottem_vel = gottem.velocity
+            hw = self.hitbox.width
+            gw = gottem.hitbox.width
+            ratio = hw * hw / (gw * gw)     # Self over gottem, by hitbox area
+            inv_ratio = 1.0 / ratio
+            gottem_on_self_force = vectorHelper.vec_mul(vectorHelper.vec_sub(gottem_vel, self_vel), inv_ratio)
+            self_on_gottem_force = vectorHelper.vec_mul(vectorHelper.vec_sub(self_vel, gottem_vel), ratio)
+
+            self.velocity = vectorHelper.vec_add(self_vel, gottem_on_self_force)
+            gottem.velocity = vectorHelper.vec_add(gottem_vel, self_on_gottem_force)
 
     def reward_player(self):
-        if self.target is None or not self.health > float('-inf'):
+        target = self.target
+        if target is None or not self.health > NEG_INF:
             return
-        distance = vectorHelper.vec_len(self.position, self.target.position)
-        if distance <= self.hitbox.width * 10:
-            heal_amount = self.reward * (self.target.power if self.target.power < self.max_health else self.max_health)
+        width = self.hitbox.width
+        if vectorHelper.vec_len_sq(self.position, target.position) <= (width * 10) ** 2:
+            power = target.power
+            heal_amount = self.reward * (power if power < self.max_health else self.max_health)
             heal_amount *= self.max_speed / 400
-            heal_amount *= 10 / self.hitbox.width
-            heal_amount *= 1.5 if self.type in {EnemyTypes.PEW_PEW, EnemyTypes.BIG_PEW_PEW, EnemyTypes.SPAWNCEPTION, EnemyTypes.DIFFICULTY_LONGINUS} else 1
-            heal_amount *= 2 if self.type in {EnemyTypes.SPAWNCEPTION, EnemyTypes.DIFFICULTY_LONGINUS} else 1
-            self.target.heal(int(round(heal_amount)))
+            heal_amount *= 10 / width
+            heal_amount *= 1.5 if self.type in BONUS_REWARD_TYPES else 1
+            heal_amount *= 2 if self.type in DOUBLE_REWARD_TYPES else 1
+            target.heal(int(round(heal_amount)))
             if self.env is not None:
                 self.env.score += heal_amount
 
+    def on_death(self):
+        self.reward_player()
+        # Explosive Rammers explode when they run out of health
+        if self.type == EnemyTypes.EXPLOSIVE_RAMMER:
+            self.explode()
+    def on_out_of_bounds(self):
+        # Explosive Rammers explode before being removed
+        if self.type == EnemyTypes.EXPLOSIVE_RAMMER:
+            self.explode()
+
     def update(self, dt: float):
-        # If Explosive Rammers run out of health, they explode
         if self.target is not None:
             self.find_goal()
         self.collide(dt)
@@ -572,6 +715,8 @@ class Enemy(Hittable):
 
 class Spawner(Hittable):
     """Enemy spawner object"""
+    kind = "spawners"
+    leaves_husk = True
     def __init__(self, position: Tuple[float, float],
                  difficulty: int = 0,
                  target: Player = None,
@@ -582,12 +727,12 @@ class Spawner(Hittable):
                            SPAWNER_HITBOX_SIZE)
         health = 100 + difficulty * 10
         super().__init__(position, 0.0, health, hitbox=rect, i_time=100, env=env)
-        idx = int(math.cbrt(random.randint(0, difficulty ** 2))) % len(EnemyTypes) # Enemy type value, wrapping around if over
+        idx = int(math.cbrt(self.env.np_random.integers(0, difficulty ** 2, endpoint=True))) % len(EnemyTypes) # Enemy type value, wrapping around if over
         self.spawn_type = EnemyTypes(idx)
         self.difficulty = difficulty
         self.target = target
         spawn_timer = max(500, 5000 - difficulty * 200) # in ms
-        last_spawn_time = get_current_time(self.env) + random.randint(0, spawn_timer)
+        last_spawn_time = get_current_time(self.env) + int(self.env.np_random.integers(0, spawn_timer, endpoint=True))
         self.source = Fabricator(spawn_cooldown=spawn_timer, last_spawn_time=last_spawn_time, env=self.env)
 
     def reward_player(self):
@@ -595,14 +740,17 @@ class Spawner(Hittable):
             return
         heal_amount = (self.difficulty + 1) * 2 * (self.target.power if self.target.power < self.max_health else self.max_health)
         heal_amount *= 10 / self.hitbox.width
-        heal_amount *= 1.5 if self.spawn_type in {EnemyTypes.PEW_PEW, EnemyTypes.BIG_PEW_PEW, EnemyTypes.SPAWNCEPTION, EnemyTypes.DIFFICULTY_LONGINUS} else 1
-        heal_amount *= 2 if self.spawn_type in {EnemyTypes.SPAWNCEPTION, EnemyTypes.DIFFICULTY_LONGINUS} else 1
+        heal_amount *= 1.5 if self.spawn_type in BONUS_REWARD_TYPES else 1
+        heal_amount *= 2 if self.spawn_type in DOUBLE_REWARD_TYPES else 1
         self.target.heal(int(round(heal_amount)))
         if self.env is not None:
             self.env.score += heal_amount
 
+    def on_death(self):
+        self.reward_player()
+
     def update(self, dt: float):
-        if self.out_of_health():
+        if 0 >= self.health > NEG_INF:
             self.reward_player()
         super().update(dt)
         if self.source.try_spawn_with_cooldown(self.position, SPAWN_ENEMY, self.difficulty, self.target, self.spawn_type):
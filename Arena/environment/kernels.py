@@ -0,0 +1,64 @@
+"""Numeric kernels for the per-step hot path, compiled with Numba when it is installed"""
+
+import math
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def nearest_loop(xy: np.ndarray, ax: float, ay: float, bounds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Plain loop version of `nearest_in_slices`, the one Numba compiles\n
+    Returns index and distance arrays with one entry per slice, (-1, 10000.0) for empty slices
+    """
+    indices = np.full(bounds.shape[0], -1, dtype=np.int64)
+    distances = np.full(bounds.shape[0], 10000.0)
+    start = 0
+    for s in range(bounds.shape[0]):
+        end = bounds[s]
+        best = math.inf
+        for i in range(start, end):
+            dx = xy[i, 0] - ax
+            dy = xy[i, 1] - ay
+            d2 = dx * dx + dy * dy
+            # Strict comparison keeps the first of equally near targets, like argmin
+            if d2 < best:
+                best = d2
+                indices[s] = i - start
+        if indices[s] >= 0:
+            distances[s] = math.sqrt(best)
+        start = end
+    return indices, distances
+
+
+def nearest_in_slices(xy: np.ndarray, point: Tuple[float, float], bounds: Tuple[int, ...]) -> List[Tuple[int, float]]:
+    """
+    Index of and distance to the row of `xy` nearest to `point`, for each consecutive slice ending at `bounds`\n
+    Indices are relative to their slice, (-1, 10000.0) if the slice is empty
+    """
+    d2 = np.sum((xy - point) ** 2, axis=1)
+    nearest = []
+    start = 0
+    for end in bounds:
+        if end == start:
+            nearest.append((-1, 10000.0))
+        else:
+            idx = int(d2[start:end].argmin())
+            nearest.append((idx, math.sqrt(d2[start + idx])))
+        start = end
+    return nearest
+
+
+if njit is not None:
+    # cache=True keeps the compiled loop on disk so only the first run pays for compiling
+    _nearest_loop_jit = njit(cache=True)(nearest_loop)
+
+    def nearest_in_slices(xy: np.ndarray, point: Tuple[float, float], bounds: Tuple[int, ...]) -> List[Tuple[int, float]]:
+        """Numba compiled `nearest_in_slices`"""
+        indices, distances = _nearest_loop_jit(xy, float(point[0]), float(point[1]), np.array(bounds, dtype=np.int64))
+        return list(zip(indices.tolist(), distances.tolist()))
@@ -62,7 +62,7 @@ def lines_shot_builder(bullet_list: List[Dict[str, float]],
 
                        burst_line_bullet_amount: int = 1, burst_line_bullet_dist: List[float] = [4.0],
                        randomize_bullet_offset: bool = False, max_bullet_offset: float = 0.0,
-                       default_bullet_speed: int = 20, bullet_speed_scale_style: Set[BulletSpeedScaleStyle] = [],
+                       default_bullet_speed: int = 20, bullet_speed_scale_style: Set[BulletSpeedScaleStyle] = frozenset(),
                        bullet_speed_scale_speed: Tuple[float, float, float, float] = (1.0, 1.0, 1.0, 1.0)):
     """
     Generate and append encoded danmaku bullets to provided target list\n
@@ -88,28 +88,34 @@ def lines_shot_builder(bullet_list: List[Dict[str, float]],
     if bullet_list is None:
         return
     # If shot duration is provided and burst delay list is empty, calculate burst_delay
+    # Built as a new list, the caller's list (or a shared default) is never modified
     if shot_duration is not None and len(shot_burst_delay) == 0:
-        shot_burst_delay.clear()
-        for i in range(shot_burst_amount):
-            delay = i * int(shot_duration / shot_burst_amount)
-            shot_burst_delay.append(delay)
+        shot_burst_delay = [i * int(shot_duration / shot_burst_amount) for i in range(shot_burst_amount)]
     
 
+    # Speed scaling styles do not change during the shot, test them once
+    scale_by_distance = BulletSpeedScaleStyle.DISTANCE_FROM_ORIGIN in bullet_speed_scale_style
+    scale_by_burst = BulletSpeedScaleStyle.BURST_INDEX in bullet_speed_scale_style
+    scale_randomly = BulletSpeedScaleStyle.RANDOM in bullet_speed_scale_style
+
     for burst_no in range(shot_burst_amount):
         delay = shot_burst_delay[burst_no % len(shot_burst_delay)]
         line_amount = burst_line_amount[burst_no % len(burst_line_amount)]
         line_angle_offset_max = burst_line_angle_offset_max[burst_no % len(burst_line_angle_offset_max)]
+        color = (int(burst_no * 127.5), int((2 - burst_no) * 127.5), 0)
         for line in range(line_amount):
-            angle = burst_line_angle_offset_max * 2 * line / (line_amount - 1) - burst_line_angle_offset_max
+            # Lines are spread evenly across the offset range, a single line goes straight at the aim
+            if line_amount > 1:
+                angle = line_angle_offset_max * 2 * line / (line_amount - 1) - line_angle_offset_max
+            else:
+                angle = 0.0
             for dist in burst_line_bullet_dist:
                 # Bullet speed scaling
                 speed = default_bullet_speed
-                speed *= dist * bullet_speed_scale_speed[0] if BulletSpeedScaleStyle.DISTANCE_FROM_ORIGIN in bullet_speed_scale_style else 1
-                speed *= burst_no * bullet_speed_scale_speed[1] if BulletSpeedScaleStyle.BURST_INDEX in bullet_speed_scale_style else 1
-                speed = speed ** (random.random() * 2 * bullet_speed_scale_speed[3]) if BulletSpeedScaleStyle.RANDOM in bullet_speed_scale_style else speed
-                color_r = int(burst_no * 127.5)
-                color_g = int((2 - burst_no) * 127.5)
-                bullet_list.append[encode_danmaku_bullet(dist, angle, speed, 2, delay, (color_r, color_g, 0))]
+                speed *= dist * bullet_speed_scale_speed[0] if scale_by_distance else 1
+                speed *= burst_no * bullet_speed_scale_speed[1] if scale_by_burst else 1
+                speed = speed ** (random.random() * 2 * bullet_speed_scale_speed[3]) if scale_randomly else speed
+                bullet_list.append(encode_danmaku_bullet(dist, angle, speed, 2, delay, color))
     
 
 class Longinus(entities.Enemy):
@@ -127,7 +133,7 @@ class Longinus(entities.Enemy):
         self.phase = LonginusPhaseList.PRESPELL_1
         self.pattern: List[List[Dict[str, float]]] = []
         
-    def achieve_goal(self, current_time):
+    def achieve_goal(self, current_time, dt):
 
         return
 
@@ -2,7 +2,7 @@
 
 import pygame
 import math
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict
 import environment.entities as entities
 import environment.longinus as longinus
 from environment.arena import ArenaEnv as Arena
@@ -15,7 +15,7 @@ WHITE   = (255, 255, 255)
 BLACK   = (0  , 0  , 0  )
 
 def get_current_time(env: Arena):
-    return env.step_count * 1000 / 60 if env is not None else 0
+    return env.step_count * 1000 / env.physics_fps if env is not None else 0
 
 def change_color_brightness(rgb: Tuple[int, int, int], per: int|float = 100) -> Tuple[int, int, int]:
     """Return an RGB tuple with brightness of `per`%"""
@@ -59,6 +59,8 @@ class ArenaRenderer:
         self.clock: Optional[pygame.time.Clock] = None
         self.font: Optional[pygame.font.Font] = None
         self.font_small: Optional[pygame.font.Font] = None
+        # Pre-drawn bullet surfaces keyed by (color, size)
+        self.bullet_sprites: Dict[Tuple[Tuple[int, int, int], int], pygame.Surface] = {}
     
     def init_display(self, env: Arena, title: str = "Never gonna give you up"):
         """Initialize the renderer"""
@@ -121,29 +123,32 @@ class ArenaRenderer:
             
     def draw_hittables(self, env: Arena):
         """Draw everything in the `hittables` list"""
-        for htb in env.hittables:
+        for index, htb in enumerate(env.hittables):
+            # Dispatch on the kind tag, a class attribute read instead of an isinstance chain
+            kind = htb.kind
             # Draw player
-            if isinstance(htb, entities.Agent):
-                self.draw_player(env)
+            if kind is None:
+                if isinstance(htb, entities.Agent):
+                    self.draw_player(env)
             # Draw spawners
-            elif isinstance(htb, entities.Spawner):
+            elif kind == "spawners":
                 self.draw_health_bar(htb)
                 pygame.draw.circle(self.screen, WHITE if htb.invincible else self.COL_SPAWNER, htb.position,
                                    htb.hitbox.width/math.sqrt(2))
                 point_amount = htb.spawn_type.value + 3
                 point_distance = htb.hitbox.width / 2 * 1.25 if point_amount == 3 else htb.hitbox.width / 2 * 0.75 if point_amount == 4 else htb.hitbox.width / 2 * 0.7
-                angle = get_current_time(env) / 50 + math.radians(env.hittables.index(htb))
+                angle = get_current_time(env) / 50 + math.radians(index)
                 self.draw_regular_polygon(htb.position, point_amount, angle, point_distance,
                                           WHITE if htb.invincible else self.COL_ENEMIES[htb.spawn_type])
             # Draw enemies
-            elif isinstance(htb, entities.Enemy):
+            elif kind == "enemies":
                 self.draw_health_bar(htb)
                 point_amount = htb.type.value + 3
                 point_distance = htb.hitbox.width * 1.25 if point_amount == 3 else htb.hitbox.width * 0.75 if point_amount == 4 else htb.hitbox.width * 0.7
                 self.draw_regular_polygon(htb.position, point_amount, htb.angle, point_distance,
                                           WHITE if htb.invincible else self.COL_ENEMIES[htb.type])
             # Draw husks
-            elif isinstance(htb, entities.Husk):
+            elif kind == "husks":
                 if htb.type is not None:
                     point_amount = htb.type.value + 3
                     point_distance = htb.size * 1.25 if point_amount == 3 else htb.size * 0.75 if point_amount == 4 else htb.size * 0.7
@@ -153,21 +158,35 @@ class ArenaRenderer:
                     pygame.draw.circle(self.screen, self.huskify(self.COL_SPAWNER), htb.position,
                                    htb.size/math.sqrt(2))
                 
+    def get_bullet_sprite(self, color: Tuple[int, int, int], size: int) -> pygame.Surface:
+        """Return the cached surface of a bullet with `color` and hitbox width `size`"""
+        key = (color, size)
+        sprite = self.bullet_sprites.get(key)
+        if sprite is None:
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            center = (size / 2, size / 2)
+            # Outer edge
+            pygame.draw.circle(sprite, change_color_saturation(color, 100), center, size/2)
+            # Mantle
+            pygame.draw.circle(sprite, change_color_saturation(color, 200 / 3), center, size * 3/8)
+            # Outer core
+            pygame.draw.circle(sprite, change_color_saturation(color, 100 / 3), center, size/4)
+            # Core
+            pygame.draw.circle(sprite, WHITE, center, size/8)
+            self.bullet_sprites[key] = sprite
+        return sprite
+
     def draw_bullets(self, env: Arena):
-        """Draw everything from the `bullets` list"""
+        """Draw everything from the `bullets` list with a single blits call"""
+        sequence = []
         for b in env.bullets:
             # Draw normal bullets
             color = RED
             if isinstance(b, longinus.Danmaku):
                 color = b.color
-            # Outer edge
-            pygame.draw.circle(self.screen, change_color_saturation(color, 100), b.position, b.hitbox.width/2)
-            # Mantle
-            pygame.draw.circle(self.screen, change_color_saturation(color, 200 / 3), b.position, b.hitbox.width * 3/8)
-            # Outer core
-            pygame.draw.circle(self.screen, change_color_saturation(color, 100 / 3), b.position, b.hitbox.width/4)
-            # Core
-            pygame.draw.circle(self.screen, WHITE, b.position, b.hitbox.width/8)
+            size = b.hitbox.width
+            sequence.append((self.get_bullet_sprite(color, size), (b.position[0] - size / 2, b.position[1] - size / 2)))
+        self.screen.blits(sequence, doreturn=False)
     
     def draw_teleporter(self, env: Arena):
         """Draw spawner spawn indicator"""
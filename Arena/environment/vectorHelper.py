@@ -34,6 +34,11 @@ def vec_len(*args) -> float:
     (List[Tuple[]]): Distance between first and last point in list\n
     (Tuple, Tuple): Distance between two points
     """
+    # Distance between two points, the most common call, checked first
+    if len(args) == 2:
+        p1, p2 = args
+        return math.hypot(p2[0] - p1[0], p2[1] - p1[1])
+
     if len(args) == 1:
         x = args[0]
 
@@ -46,22 +51,28 @@ def vec_len(*args) -> float:
             p1, p2 = x[0], x[-1]
             return math.hypot(p2[0] - p1[0], p2[1] - p1[1])
 
-    elif len(args) == 2:
-        # Distance between two points
-        p1, p2 = args
-        return math.hypot(p2[0] - p1[0], p2[1] - p1[1])
-
     raise TypeError("Invalid arguments for length()")
 
+def vec_len_sq(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
+    """Squared distance between two points, for comparisons where the sqrt is not needed"""
+    dx = p2[0] - p1[0]
+    dy = p2[1] - p1[1]
+    return dx * dx + dy * dy
+
 def vec_to_ang(v: Tuple[float, float]) -> float:
     """Angle from origin (degrees)"""
     return math.degrees(math.atan2(v[1], v[0])) % 360
 
+# Unit vectors of whole-degree angles, the agent only ever turns in whole-degree steps
+ANG_LUT = {a: (math.cos(math.radians(a)), math.sin(math.radians(a))) for a in range(-360, 361)}
+
 def ang_to_vec(d: float) -> Tuple[float, float]:
     """Vector from angle (degrees)"""
-    x = math.cos(math.radians(d))
-    y = math.sin(math.radians(d))
-    return (x, y)
+    vec = ANG_LUT.get(d)
+    if vec is not None:
+        return vec
+    rad = math.radians(d)
+    return (math.cos(rad), math.sin(rad))
 
 def vec_sub(a: Tuple[float, float], b: Tuple[float, float]) -> Tuple:
     """Subtract vector b from a."""
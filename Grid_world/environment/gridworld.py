@@ -10,7 +10,7 @@ A_UP, A_RIGHT, A_DOWN, A_LEFT = 0, 1, 2, 3
 ALL_ACTIONS = [A_UP, A_RIGHT, A_DOWN, A_LEFT]
 
 
-@dataclass
+@dataclass(slots=True)
 class StepResult:
     next_state: Tuple
     reward: float